@@ -1,19 +1,45 @@
 """
 Click command to do static annotation searching via Stevedore plugins.
 """
+import copy
 import datetime
-import errno
+import functools
 import os
 import re
+import sys
 from abc import ABCMeta, abstractmethod
 
 import yaml
-from stevedore import named
 
 from code_annotations import annotation_errors
 from code_annotations.exceptions import ConfigurationException
 from code_annotations.helpers import VerboseEcho
 
+try:
+    # Use the much faster libyaml bindings when PyYAML was built with them
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeDumper, SafeLoader
+
+
+@functools.lru_cache(maxsize=32)
+def _load_raw_config(config_file_path, mtime_ns, size):  # pylint: disable=unused-argument
+    """
+    Load a configuration file, caching its contents for as long as the file is not modified.
+
+    Args:
+        config_file_path: Path to the configuration file
+        mtime_ns: Modification time of the file, only used as part of the cache key
+        size: Size of the file in bytes, only used as part of the cache key
+
+    Returns:
+        Python representation of the YAML config file
+    """
+    # Read the whole file at once and let the loader decode it, rather than having it pull small chunks of text
+    with open(config_file_path, 'rb') as config_file:
+        return yaml.load(config_file.read(), Loader=SafeLoader)
+
 
 class AnnotationConfig:
     """
@@ -31,17 +57,26 @@ class AnnotationConfig:
             source_path_override: Path to search if we're static code searching, if overridden on the command line
         """
         self.groups = {}
+        self.group_sets = {}
+        self.required_group_tokens = {}
+        self.token_to_group = {}
         self.choices = {}
+        self.choice_sets = {}
         self.optional_groups = []
         self.annotation_tokens = []
+        self._annotation_tokens_set = set()
         self.annotation_regexes = []
         self.mgr = None
+        self.config_file_path = config_file_path
 
         # Global logger, other objects can hold handles to this
         self.echo = VerboseEcho()
 
-        with open(config_file_path) as config_file:
-            raw_config = yaml.safe_load(config_file)
+        # The cached configuration is copied, since the configuration objects built from it may be modified
+        config_stat = os.stat(config_file_path)
+        raw_config = copy.deepcopy(
+            _load_raw_config(os.path.abspath(config_file_path), config_stat.st_mtime_ns, config_stat.st_size)
+        )
 
         self._check_raw_config_keys(raw_config)
 
@@ -138,12 +173,13 @@ class AnnotationConfig:
             return True
         if isinstance(token_or_group, dict):
             # If annotation is a dict, only a few keys are tolerated
-            return set(token_or_group.keys()).issubset({"choices", "optional"})
+            return token_or_group.keys() <= {"choices", "optional"}
         return False
 
     def _add_annotation_token(self, token):
-        if token in self.annotation_tokens:
+        if token in self._annotation_tokens_set:
             raise ConfigurationException(f'{token} is configured more than once, tokens must be unique.')
+        self._annotation_tokens_set.add(token)
         self.annotation_tokens.append(token)
 
     def _configure_coverage(self, coverage_target):
@@ -188,22 +224,31 @@ class AnnotationConfig:
             raise ConfigurationException(f'Group "{group_name}" must have more than one annotation.')
 
         for annotation in group:
-            for annotation_token in annotation:
-                annotation_value = annotation[annotation_token]
+            for annotation_token, annotation_value in annotation.items():
+                annotation_token = sys.intern(annotation_token)
 
                 # Otherwise it should be a text type, if not then error out
                 if not self._is_annotation_token(annotation_value):
                     raise ConfigurationException(f'{annotation} is an unknown annotation type.')
-                # The annotation comment is a choice group
-                if self._is_choice_group(annotation_value):
-                    self._configure_choices(annotation_token, annotation_value)
-                # The annotation comment is not mandatory
-                if self._is_optional_group(annotation_value):
-                    self.optional_groups.append(annotation_token)
+                # Only annotations with options need further configuration, plain text annotations are None
+                if annotation_value:
+                    # The annotation comment is a choice group
+                    if self._is_choice_group(annotation_value):
+                        self._configure_choices(annotation_token, annotation_value)
+                    # The annotation comment is not mandatory
+                    if self._is_optional_group(annotation_value):
+                        self.optional_groups.append(annotation_token)
 
                 self.groups[group_name].append(annotation_token)
+                self.token_to_group[annotation_token] = group_name
                 self._add_annotation_token(annotation_token)
-                self.annotation_regexes.append(re.escape(annotation_token))
+
+        # Frozen sets of group members, for fast membership tests while linting
+        self.group_sets[group_name] = frozenset(self.groups[group_name])
+        # Non-optional group members, in configuration order, which must all be present in an annotation group
+        self.required_group_tokens[group_name] = [
+            token for token in self.groups[group_name] if token not in self.optional_groups
+        ]
 
     def _configure_choices(self, annotation_token, annotation):
         """
@@ -214,6 +259,7 @@ class AnnotationConfig:
             annotation: The annotation body (list of choices)
         """
         self.choices[annotation_token] = annotation['choices']
+        self.choice_sets[annotation_token] = frozenset(annotation['choices'])
 
     def _configure_annotations(self, raw_config):
         """
@@ -226,8 +272,8 @@ class AnnotationConfig:
         """
         annotation_tokens = raw_config['annotations']
 
-        for annotation_token_or_group_name in annotation_tokens:
-            annotation = annotation_tokens[annotation_token_or_group_name]
+        for annotation_token_or_group_name, annotation in annotation_tokens.items():
+            annotation_token_or_group_name = sys.intern(annotation_token_or_group_name)
 
             if self._is_annotation_group(annotation):
                 self._configure_group(annotation_token_or_group_name, annotation)
@@ -235,7 +281,6 @@ class AnnotationConfig:
             elif self._is_choice_group(annotation):
                 self._configure_choices(annotation_token_or_group_name, annotation)
                 self._add_annotation_token(annotation_token_or_group_name)
-                self.annotation_regexes.append(re.escape(annotation_token_or_group_name))
 
             elif not self._is_annotation_token(annotation):  # pragma: no cover
                 raise TypeError(
@@ -243,11 +288,13 @@ class AnnotationConfig:
                 )
             else:
                 self._add_annotation_token(annotation_token_or_group_name)
-                self.annotation_regexes.append(re.escape(annotation_token_or_group_name))
 
-        self.echo.echo_v(f"Groups configured: {self.groups}")
-        self.echo.echo_v(f"Choices configured: {self.choices}")
-        self.echo.echo_v(f"Annotation tokens configured: {self.annotation_tokens}")
+        # Tokens are unique, so each one gets exactly one escaped regex, in configuration order
+        self.annotation_regexes = [re.escape(token) for token in self.annotation_tokens]
+
+        self.echo.echo_v("Groups configured: {}", self.groups)
+        self.echo.echo_v("Choices configured: {}", self.choices)
+        self.echo.echo_v("Annotation tokens configured: {}", self.annotation_tokens)
 
     def _plugin_load_failed_handler(self, *args, **kwargs):
         """
@@ -274,8 +321,11 @@ class AnnotationConfig:
         Raises:
             ConfigurationException
         """
+        # Stevedore scans installed package metadata on import, only pay for it once extensions are actually loaded
+        from stevedore import named  # pylint: disable=import-outside-toplevel
+
         # These are the names of all of our configured extensions
-        configured_extension_names = self.extensions.keys()
+        configured_extension_names = tuple(self.extensions)
 
         # Load Stevedore extensions that we are configured for (and only those)
         self.mgr = named.NamedExtensionManager(
@@ -287,13 +337,13 @@ class AnnotationConfig:
         )
 
         # Output extension names listed in configuration
-        self.echo.echo_vv("Configured extension names: {}".format(" ".join(configured_extension_names)))
+        self.echo.echo_vv("Configured extension names: {}", " ".join(configured_extension_names))
 
         # Output found extension entry points from setup.py|cfg (whether or not they were loaded)
-        self.echo.echo_vv("Stevedore entry points found: {}".format(str(self.mgr.list_entry_points())))
+        self.echo.echo_vv("Stevedore entry points found: {}", self.mgr.list_entry_points())
 
         # Output extensions that were actually able to load
-        self.echo.echo_v("Loaded extensions: {}".format(" ".join([x.name for x in self.mgr.extensions])))
+        self.echo.echo_v("Loaded extensions: {}", " ".join([x.name for x in self.mgr.extensions]))
 
         if len(self.mgr.extensions) != len(configured_extension_names):
             raise ConfigurationException('Not all configured extensions could be loaded! Asked for {} got {}.'.format(
@@ -332,27 +382,33 @@ class BaseSearch(metaclass=ABCMeta):
         Returns:
             None, modifies all_results
         """
+        choices = self.config.choices
+
         for annotations in results:
             if not annotations:
                 continue
 
-            # TODO: The file_path should be the same for all of these results
-            # so we should be able to optimize getting file_path and making
-            # sure it exists in the dict to do this less often.
-            file_path = annotations[0]['filename']
-
-            if file_path not in all_results:  # pragma: no cover
-                all_results[file_path] = []
+            # All of these results come from the same file
+            filename = annotations[0]['filename']
 
             for annotation in annotations:
-                # If this is a "choices" type of annotation, split the comment into a list.
-                # Actually checking the choice validity happens later in _check_results_choices.
-                if annotation['annotation_token'] in self.config.choices:
-                    annotation['annotation_data'] = re.split(r',\s?|\s', annotation['annotation_data'])
+                # Found tokens are interned, like configured ones, so that the many lookups made while linting and
+                # reporting compare them by identity.
+                token = annotation['annotation_token'] = sys.intern(annotation['annotation_token'])
+
+                # If this is a "choices" type of annotation, split the comment into a list. Choices are separated by
+                # commas and/or whitespace. Actually checking the choice validity happens later in
+                # _check_results_choices.
+                if token in choices:
+                    annotation['annotation_data'] = annotation['annotation_data'].replace(',', ' ').split()
 
             # TODO: De-dupe results? Should only be necessary if more than one
             # Stevedore extension is working on the same file type
-            all_results[file_path].extend(annotations)
+            file_results = all_results.get(filename)
+            if file_results is None:
+                all_results[filename] = list(annotations)
+            else:
+                file_results.extend(annotations)
 
     def _check_results_choices(self, annotation):
         """
@@ -368,48 +424,47 @@ class BaseSearch(metaclass=ABCMeta):
         Args:
             annotation: A single search result dict.
         """
+        token = annotation['annotation_token']
+        valid_choice_set = self.config.choice_sets.get(token)
+
         # Not a choice type of annotation, nothing to do
-        if annotation['annotation_token'] not in self.config.choices:
+        if valid_choice_set is None:
             return None
 
-        token = annotation['annotation_token']
-        found_valid_choices = []
+        valid_choices = self.config.choices[token]
+
+        found_valid_choices = set()
 
         # If the line begins with an annotation token that should have choices, but has no text after the token,
-        # the first split will be empty.
-        if annotation['annotation_data'][0] != "":
+        # the split will be empty.
+        if annotation['annotation_data']:
             for choice in annotation['annotation_data']:
-                if choice not in self.config.choices[token]:
+                if choice not in valid_choice_set:
                     self._add_annotation_error(
                         annotation,
                         annotation_errors.InvalidChoice,
-                        (choice, token, self.config.choices[token])
+                        (choice, token, valid_choices)
                     )
                 elif choice in found_valid_choices:
                     self._add_annotation_error(annotation, annotation_errors.DuplicateChoiceValue, (choice,))
                 else:
-                    found_valid_choices.append(choice)
+                    found_valid_choices.add(choice)
         else:
             self._add_annotation_error(
                 annotation,
                 annotation_errors.MissingChoiceValue,
-                (token, self.config.choices[token])
+                (token, valid_choices)
             )
         return None
 
     def _get_group_children(self):
         """
-        Create a list of all annotation tokens that are part of a group.
+        Get all annotation tokens that are part of a group.
 
         Returns:
-            List of annotation tokens that are configured to be in groups
+            Set-like view of annotation tokens that are configured to be in groups
         """
-        group_children = []
-
-        for group in self.config.groups:
-            group_children.extend(self.config.groups[group])
-
-        return group_children
+        return self.config.token_to_group.keys()
 
     def _get_group_for_token(self, token):
         """
@@ -421,10 +476,7 @@ class BaseSearch(metaclass=ABCMeta):
         Returns:
             The group name, or None if it doesn't belong to a group.
         """
-        for group in self.config.groups:
-            if token in self.config.groups[group]:
-                return group
-        return None
+        return self.config.token_to_group.get(token)
 
     def check_results(self, all_results):
         """
@@ -441,9 +493,9 @@ class BaseSearch(metaclass=ABCMeta):
         self.echo.pprint(all_results, indent=3, verbosity_level=2)
 
         # Spin through the search results
-        for filename in all_results:
-            for annotations in self.iter_groups(all_results[filename]):
-                self.check_group(annotations)
+        for annotations in all_results.values():
+            for annotation_group in self.iter_groups(annotations):
+                self.check_group(annotation_group)
         return not self.errors
 
     def iter_groups(self, annotations):
@@ -462,13 +514,13 @@ class BaseSearch(metaclass=ABCMeta):
         current_object_id = None
         for annotation in annotations:
             line_number = annotation["line_number"]
-            object_id = annotation.get("extra", {}).get("object_id")
-            line_number_changed = line_number != current_line_number
-            object_id_changed = object_id != current_object_id
-            if line_number_changed or object_id_changed:
+            extra = annotation.get("extra")
+            object_id = extra.get("object_id") if extra else None
+            if line_number != current_line_number or object_id != current_object_id:
                 if current_group:
                     yield current_group
-                current_group.clear()
+                # Each group is a new list, so that groups kept by the caller are not emptied by the next one
+                current_group = []
             current_group.append(annotation)
             current_line_number = line_number
             current_object_id = object_id
@@ -487,23 +539,32 @@ class BaseSearch(metaclass=ABCMeta):
         - There is no duplicate
         - All non-optional tokens are present
         """
+        # Bind lookups used for every annotation to locals, this loop runs once per annotation found
+        check_results_choices = self._check_results_choices
+        add_annotation_error = self._add_annotation_error
+        token_to_group = self.config.token_to_group
+
         found_tokens = set()
         group_tokens = []
+        group_token_set = set()
+        required_tokens = []
         group_name = None
         for annotation in annotations:
             token = annotation["annotation_token"]
             if not group_name:
-                group_name = self._get_group_for_token(token)
+                group_name = token_to_group.get(token)
                 if group_name:
                     group_tokens = self.config.groups[group_name]
+                    group_token_set = self.config.group_sets[group_name]
+                    required_tokens = self.config.required_group_tokens[group_name]
 
             # Check if choice field
-            self._check_results_choices(annotation)
+            check_results_choices(annotation)
 
             # Check token belongs to group
             if group_name:
-                if token not in group_tokens:
-                    self._add_annotation_error(
+                if token not in group_token_set:
+                    add_annotation_error(
                         annotation,
                         annotation_errors.InvalidToken,
                         (
@@ -515,7 +576,7 @@ class BaseSearch(metaclass=ABCMeta):
 
             # Check for duplicates
             if token in found_tokens:
-                self._add_annotation_error(
+                add_annotation_error(
                     annotation,
                     annotation_errors.DuplicateToken,
                     (token,)
@@ -524,14 +585,13 @@ class BaseSearch(metaclass=ABCMeta):
                 found_tokens.add(token)
 
         # Check for missing tokens
-        for token in group_tokens:
-            if token not in self.config.optional_groups:
-                if token not in found_tokens:
-                    self._add_annotation_error(
-                        annotations[0],
-                        annotation_errors.MissingToken,
-                        (token,)
-                    )
+        for token in required_tokens:
+            if token not in found_tokens:
+                add_annotation_error(
+                    annotations[0],
+                    annotation_errors.MissingToken,
+                    (token,)
+                )
 
     def _add_annotation_error(self, annotation, error_type, args=None):
         """
@@ -545,8 +605,9 @@ class BaseSearch(metaclass=ABCMeta):
         """
         args = args or tuple()
         error_message = error_type.message % args
-        location = annotation.get("extra", {}).get("object_id", annotation["line_number"])
-        message = "{}::{}: {}".format(annotation['filename'], location, error_message)
+        extra = annotation.get("extra")
+        location = extra.get("object_id", annotation["line_number"]) if extra else annotation["line_number"]
+        message = f"{annotation['filename']}::{location}: {error_message}"
         self.annotation_errors.append((annotation, error_type, args))
         self._add_error(message)
 
@@ -572,34 +633,37 @@ class BaseSearch(metaclass=ABCMeta):
         """
         Format the given results dict for reporting purposes.
 
+        Annotations are given their report group id in place, and each file's list of annotations is reused rather than
+        copied, since every annotation ends up in the report in its original order.
+
         Args:
             all_results: Dict of all results found in a search
 
         Returns:
             Dict of results arranged for reporting
         """
+        # Bind lookups used for every annotation to locals
+        echo_vv = self.echo.echo_vv
+        echo_vvv = self.echo.echo_vvv
+        iter_groups = self.iter_groups
+
         formatted_results = {}
         current_group_id = 0
-        for filename in all_results:
-            self.echo.echo_vv(f"report_format: formatting {filename}")
-            formatted_results[filename] = []
-            for annotation_group in self.iter_groups(all_results[filename]):
+        for filename, annotations in all_results.items():
+            echo_vv("report_format: formatting {}", filename)
+            formatted_results[filename] = annotations
+            for annotation_group in iter_groups(annotations):
                 current_group_id += 1
                 for annotation_index, annotation in enumerate(annotation_group):
                     token = annotation['annotation_token']
-                    self.echo.echo_vvv(f"report_format: formatting annotation token {token}")
+                    echo_vvv("report_format: formatting annotation token {}", token)
                     if annotation_index == 0:
-                        self.echo.echo_vv('Starting group id {} for "{}" token "{}", line {}'.format(
-                            current_group_id, annotation_group, token, annotation["line_number"])
+                        echo_vv(
+                            'Starting group id {} for "{}" token "{}", line {}',
+                            current_group_id, annotation_group, token, annotation["line_number"]
                         )
-                    self.echo.echo_vv(
-                        "report_format: Adding {} to group id {}".format(
-                            token,
-                            current_group_id
-                        )
-                    )
+                    echo_vv("report_format: Adding {} to group id {}", token, current_group_id)
                     annotation["report_group_id"] = current_group_id
-                    formatted_results[filename].append(annotation)
 
         return formatted_results
 
@@ -614,24 +678,44 @@ class BaseSearch(metaclass=ABCMeta):
         Returns:
             Filename of generated report
         """
-        self.echo.echo_vv(yaml.dump(all_results, default_flow_style=False))
-
-        now = datetime.datetime.utcnow()
-        report_filename = os.path.join(self.config.report_path, '{}{}.yaml'.format(
-            report_prefix, now.strftime('%Y%m%d-%H%M%S')
-        ))
+        now = datetime.datetime.now(datetime.timezone.utc)
+        report_filename = os.path.join(self.config.report_path, f'{report_prefix}{now:%Y%m%d-%H%M%S}.yaml')
 
         formatted_results = self._format_results_for_report(all_results)
 
         self.echo(f"Generating report to {report_filename}")
 
-        try:
-            os.makedirs(self.config.report_path)
-        except OSError as e:  # pragma: no cover
-            if e.errno != errno.EEXIST:
-                raise
+        os.makedirs(self.config.report_path, exist_ok=True)
 
-        with open(report_filename, 'w+') as report_file:
-            yaml.safe_dump(formatted_results, report_file, default_flow_style=False)
+        # The dumper emits many small writes, a large buffer keeps them from each becoming a syscall
+        with open(report_filename, 'w', buffering=1 << 20) as report_file:
+            if self.echo.verbosity >= 2:
+                # Serialize the results only once, both for display and for the report file
+                report_contents = ''.join(self._iter_report_documents(formatted_results))
+                self.echo.echo_vv(report_contents)
+                report_file.write(report_contents)
+            else:
+                for report_document in self._iter_report_documents(formatted_results):
+                    report_file.write(report_document)
 
         return report_filename
+
+    def _iter_report_documents(self, formatted_results):
+        """
+        Serialize report results to YAML one file at a time.
+
+        Dumping each file's annotations as its own single-key mapping, in sorted order, produces the same text as
+        dumping the whole results dict at once, while only holding one file's worth of YAML nodes in memory.
+
+        Args:
+            formatted_results: Dict of results arranged for reporting
+
+        Yields:
+            YAML text for consecutive parts of the report
+        """
+        if not formatted_results:
+            yield yaml.dump(formatted_results, Dumper=SafeDumper, default_flow_style=False)
+            return
+
+        for filename in sorted(formatted_results):
+            yield yaml.dump({filename: formatted_results[filename]}, Dumper=SafeDumper, default_flow_style=False)
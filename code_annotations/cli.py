@@ -2,18 +2,57 @@
 Command line interface for code annotation tools.
 """
 
-import datetime
+import contextlib
 import sys
+import time
 import traceback
 
 import click
 
 from code_annotations.base import AnnotationConfig, ConfigurationException
-from code_annotations.find_django import DjangoSearch
 from code_annotations.find_static import StaticSearch
-from code_annotations.generate_docs import ReportRenderer
 from code_annotations.helpers import fail
 
+# Parameter types shared by the search commands
+CONFIG_FILE_PATH = click.Path(exists=True, dir_okay=False, resolve_path=True)
+SOURCE_PATH = click.Path(exists=True, dir_okay=True, resolve_path=True)
+
+
+def echo_lint_errors(errors):
+    """
+    Output the linting errors found by a search.
+
+    The whole listing is written at once, since there can be thousands of errors.
+
+    Args:
+        errors: List of error messages
+    """
+    header = click.style(
+        f"\nSearch failed due to linting errors!\n{len(errors)} errors:\n---------------------------------", fg="red"
+    )
+    click.echo("\n".join([header] + errors))
+
+
+@contextlib.contextmanager
+def handle_command_errors(verbosity):
+    """
+    Report any error raised by a command, and exit.
+
+    Configuration problems are reported as such, a traceback would only point at the validation code. The traceback of
+    any other error is also printed when running with -v.
+
+    Args:
+        verbosity: Verbosity level from the command line
+    """
+    try:
+        yield
+    except ConfigurationException as exc:
+        fail(str(exc))
+    except Exception as exc:
+        if verbosity:
+            traceback.print_exc()
+        fail(str(exc))
+
 
 @click.group()
 def entry_point():
@@ -27,7 +66,7 @@ def entry_point():
     "--config_file",
     default=".annotations",
     help="Path to the configuration file",
-    type=click.Path(exists=True, dir_okay=False, resolve_path=True),
+    type=CONFIG_FILE_PATH,
 )
 @click.option(
     "--seed_safelist/--no_safelist",
@@ -80,8 +119,11 @@ def django_find_annotations(
     """
     Subcommand for dealing with annotations in Django models.
     """
-    try:
-        start_time = datetime.datetime.utcnow()
+    # Django takes a long time to import, only do it for the command that needs it
+    from code_annotations.find_django import DjangoSearch  # pylint: disable=import-outside-toplevel
+
+    with handle_command_errors(verbosity):
+        start_time = time.perf_counter()
 
         if (
             not coverage
@@ -119,10 +161,7 @@ def django_find_annotations(
 
                 # Check grouping and choices
                 if not searcher.check_results(annotated_models):
-                    click.secho("\nSearch failed due to linting errors!", fg="red")
-                    click.secho("{} errors:".format(len(searcher.errors)), fg="red")
-                    click.secho("---------------------------------", fg="red")
-                    click.echo("\n".join(searcher.errors))
+                    echo_lint_errors(searcher.errors)
                     # If there are any errors, do not continue
                     sys.exit(1)
                 click.echo("Linting passed without errors.")
@@ -137,20 +176,12 @@ def django_find_annotations(
             if report:
                 searcher.report(annotated_models, app_name)
 
-            annotation_count = 0
-
-            for filename in annotated_models:
-                annotation_count += len(annotated_models[filename])
+            annotation_count = sum(map(len, annotated_models.values()))
 
-            elapsed = datetime.datetime.utcnow() - start_time
+            elapsed = time.perf_counter() - start_time
             click.echo(
-                "Search found {} annotations in {} seconds.".format(
-                    annotation_count, elapsed.total_seconds()
-                )
+                f"Search found {annotation_count} annotations in {elapsed:.3f} seconds."
             )
-    except Exception as exc:
-        click.echo(traceback.print_exc())
-        fail(str(exc))
 
 
 @entry_point.command("static_find_annotations")
@@ -158,12 +189,12 @@ def django_find_annotations(
     "--config_file",
     default=".annotations",
     help="Path to the configuration file",
-    type=click.Path(exists=True, dir_okay=False, resolve_path=True),
+    type=CONFIG_FILE_PATH,
 )
 @click.option(
     "--source_path",
     help="Location of the source code to search",
-    type=click.Path(exists=True, dir_okay=True, resolve_path=True),
+    type=SOURCE_PATH,
 )
 @click.option("--report_path", default=None, help="Location to write the report")
 @click.option("-v", "--verbosity", count=True, help="Verbosity level (-v through -vvv)")
@@ -179,16 +210,24 @@ def django_find_annotations(
     default=True,
     show_default=True,
 )
+@click.option(
+    "-j",
+    "--jobs",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Number of processes used to search files in parallel",
+    show_default=True,
+)
 def static_find_annotations(
-    config_file, source_path, report_path, verbosity, lint, report
+    config_file, source_path, report_path, verbosity, lint, report, jobs
 ):
     """
     Subcommand to find annotations via static file analysis.
     """
-    try:
-        start_time = datetime.datetime.utcnow()
+    with handle_command_errors(verbosity):
+        start_time = time.perf_counter()
         config = AnnotationConfig(config_file, report_path, verbosity, source_path)
-        searcher = StaticSearch(config)
+        searcher = StaticSearch(config, jobs=jobs)
         all_results = searcher.search()
 
         if lint:
@@ -198,10 +237,7 @@ def static_find_annotations(
 
             # If there are any errors, do not generate the report
             if searcher.errors:
-                click.secho("\nSearch failed due to linting errors!", fg="red")
-                click.secho("{} errors:".format(len(searcher.errors)), fg="red")
-                click.secho("---------------------------------", fg="red")
-                click.echo("\n".join(searcher.errors))
+                echo_lint_errors(searcher.errors)
                 sys.exit(1)
             click.echo("Linting passed without errors.")
 
@@ -210,17 +246,10 @@ def static_find_annotations(
             report_filename = searcher.report(all_results)
             click.echo(f"Report written to {report_filename}.")
 
-        elapsed = datetime.datetime.utcnow() - start_time
-        annotation_count = 0
+        elapsed = time.perf_counter() - start_time
+        annotation_count = sum(map(len, all_results.values()))
 
-        for filename in all_results:
-            annotation_count += len(all_results[filename])
-
-        click.echo(f"Search found {annotation_count} annotations in {elapsed}.")
-
-    except Exception as exc:
-        click.echo(traceback.print_exc())
-        fail(str(exc))
+        click.echo(f"Search found {annotation_count} annotations in {elapsed:.3f} seconds.")
 
 
 @entry_point.command("generate_docs")
@@ -236,9 +265,12 @@ def generate_docs(config_file, verbosity, report_files):
     """
     Generate documentation from a code annotations report.
     """
-    start_time = datetime.datetime.utcnow()
+    # Jinja is only needed to render documentation
+    from code_annotations.generate_docs import ReportRenderer  # pylint: disable=import-outside-toplevel
 
-    try:
+    start_time = time.perf_counter()
+
+    with handle_command_errors(verbosity):
         config = AnnotationConfig(config_file, verbosity)
 
         for key in (
@@ -259,8 +291,5 @@ def generate_docs(config_file, verbosity, report_files):
         renderer = ReportRenderer(config, report_files)
         renderer.render()
 
-        elapsed = datetime.datetime.utcnow() - start_time
-        click.echo(f"Report rendered in {elapsed.total_seconds()} seconds.")
-    except Exception as exc:
-        click.echo(traceback.print_exc())
-        fail(str(exc))
+        elapsed = time.perf_counter() - start_time
+        click.echo(f"Report rendered in {elapsed:.3f} seconds.")
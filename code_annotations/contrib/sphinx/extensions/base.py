@@ -20,8 +20,8 @@ def find_annotations(source_path, config_path, group_by_key):
     search = StaticSearch(config)
     all_results = search.search()
     toggles = {}
-    for filename in all_results:
-        for annotations in search.iter_groups(all_results[filename]):
+    for filename, file_annotations in all_results.items():
+        for annotations in search.iter_groups(file_annotations):
             current_entry = {}
             for annotation in annotations:
                 key = annotation["annotation_token"]
@@ -69,8 +69,7 @@ class FeatureToggles(SphinxDirective):
         Iterate on the docutils nodes generated by this directive.
         """
         toggles = find_feature_toggles(self.env.config.featuretoggles_source_path)
-        for toggle_name in sorted(toggles):
-            toggle = toggles[toggle_name]
+        for toggle_name, toggle in sorted(toggles.items()):
             toggle_default_value = toggle.get(".. toggle_default:", "Not defined")
             toggle_default_node = nodes.literal(text=quote_value(toggle_default_value))
             toggle_section = nodes.section("", ids=[f"featuretoggle-{toggle_name}"])
@@ -75,7 +75,7 @@ class OpenedxEvents(SphinxDirective):
         current_subject = ""
         subject_header = None
 
-        for event_type in sorted(events):
+        for event_type, event in sorted(events.items()):
             domain = event_type.split(".")[2]
             subject = event_type.split(".")[3]
             if domain != current_domain:
@@ -92,7 +92,6 @@ class OpenedxEvents(SphinxDirective):
                 subject_header += nodes.title(text=f"Subject: {subject}")
                 domain_header += subject_header
 
-            event = events[event_type]
             event_name = event[".. event_name:"]
             event_name_literal = nodes.literal(text=event_name)
             event_data = event[".. event_data:"]
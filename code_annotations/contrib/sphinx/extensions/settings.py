@@ -77,8 +77,7 @@ class Settings(SphinxDirective):
         root_folder = (
             folder_path if os.path.isdir(source_path) else os.path.dirname(folder_path)
         )
-        for setting_name in sorted(settings):
-            setting = settings[setting_name]
+        for setting_name, setting in sorted(settings.items()):
             # setting["filename"] is relative to the root_path
             setting_filename = os.path.join(root_folder, setting["filename"])
             setting_default_value = setting.get(".. setting_default:", "Not defined")
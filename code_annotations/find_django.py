@@ -11,7 +11,7 @@ import yaml
 from django.apps import apps
 from django.db import models
 
-from code_annotations.base import BaseSearch
+from code_annotations.base import BaseSearch, SafeDumper, SafeLoader
 from code_annotations.helpers import clean_annotation, fail, get_annotation_regex
 
 DEFAULT_SAFELIST_FILE_PATH = ".annotation_safe_list.yml"
@@ -88,8 +88,8 @@ class DjangoSearch(BaseSearch):
 
 """
             safelist_file.write(safelist_comment.lstrip())
-            yaml.safe_dump(
-                safelist_data, stream=safelist_file, default_flow_style=False
+            yaml.dump(
+                safelist_data, stream=safelist_file, Dumper=SafeDumper, default_flow_style=False
             )
 
         self.echo(
@@ -206,7 +206,7 @@ class DjangoSearch(BaseSearch):
         if os.path.exists(self.config.safelist_path):
             self.echo(f"Found safelist at {self.config.safelist_path}. Reading.\n")
             with open(self.config.safelist_path) as safelist_file:
-                safelisted_models = yaml.safe_load(safelist_file)
+                safelisted_models = yaml.load(safelist_file, Loader=SafeLoader)
             self._increment_count("safelisted", len(safelisted_models))
 
             if safelisted_models:
@@ -241,7 +241,7 @@ class DjangoSearch(BaseSearch):
         # Walk all models and their parents looking for annotations
         for model in self.local_models.union(self.non_local_models):
             model_id = self.get_model_id(model)
-            self.echo.echo_vv("   " + model_id)
+            self.echo.echo_vv("   {}", model_id)
             hierarchy = inspect.getmro(model)
             model_annotations = []
 
@@ -249,25 +249,17 @@ class DjangoSearch(BaseSearch):
             for obj in hierarchy:
                 if obj.__doc__ is not None:
                     if any(anno in obj.__doc__ for anno in annotation_tokens):
-                        self.echo.echo_vvv(
-                            "      "
-                            + DjangoSearch.get_model_id(obj)
-                            + " has annotations."
-                        )
+                        self.echo.echo_vvv("      {} has annotations.", DjangoSearch.get_model_id(obj))
                         self._append_model_annotations(
                             obj, model_id, query, model_annotations
                         )
                     else:
                         # Don't use get_model_id here, as this could be a base class below Model
-                        self.echo.echo_vvv("      " + str(obj) + " has no annotations.")
+                        self.echo.echo_vvv("      {} has no annotations.", obj)
 
             # If there are any annotations in the model, format them
             if model_annotations:
-                self.echo.echo_vv(
-                    "      {} has {} total annotations".format(
-                        model_id, len(model_annotations)
-                    )
-                )
+                self.echo.echo_vv("      {} has {} total annotations", model_id, len(model_annotations))
                 self._increment_count("annotated")
                 if model_id in safelisted_models:
                     self._add_error(
@@ -279,13 +271,13 @@ class DjangoSearch(BaseSearch):
             elif model_id not in safelisted_models:
                 self._increment_count("unannotated")
                 self.uncovered_model_ids.add(model_id)
-                self.echo.echo_vv(f"      {model_id} has no annotations")
+                self.echo.echo_vv("      {} has no annotations", model_id)
 
             # Otherwise it is not annotated and in the safelist
             else:
                 if not safelisted_models[model_id]:
                     self.uncovered_model_ids.add(model_id)
-                    self.echo.echo_vv(f"      {model_id} is in the safelist.")
+                    self.echo.echo_vv("      {} is in the safelist.", model_id)
                     self._add_error(
                         f"{model_id} is in the safelist but has no annotations!"
                     )
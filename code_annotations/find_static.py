@@ -2,9 +2,16 @@
 Annotation searcher for static comment searching via Stevedore plugins.
 """
 
+import contextlib
+import io
+import itertools
 import os
+from concurrent.futures import ProcessPoolExecutor
 
-from code_annotations.base import BaseSearch
+from code_annotations.base import AnnotationConfig, BaseSearch
+
+# Number of files sent at once to each worker process of a parallel search
+SEARCH_WORKER_CHUNKSIZE = 32
 
 
 class StaticSearch(BaseSearch):
@@ -12,6 +19,18 @@ class StaticSearch(BaseSearch):
     Handles static code searching for annotations.
     """
 
+    def __init__(self, config, jobs=1):
+        """
+        Initialize for StaticSearch.
+
+        Args:
+            config: Configuration object
+            jobs: Number of processes used to search files in parallel. Parallel searches require a configuration
+                loaded from a file.
+        """
+        super().__init__(config)
+        self.jobs = jobs
+
     def search_extension(self, ext, file_handle, file_extensions_map, filename_extension):
         """
         Execute a search on the given file using the given extension.
@@ -48,13 +67,29 @@ class StaticSearch(BaseSearch):
             file_extensions_map: Mapping of file name extensions to Stevedore extensions
             all_results: A dict of annotations returned from search()
         """
+        results = self._get_file_results(full_name, known_extensions, file_extensions_map)
+
+        if results is not None:
+            # Format and add the results to our running full set
+            self.format_file_results(all_results, results)
+
+    def _get_file_results(self, full_name, known_extensions, file_extensions_map):
+        """
+        Search a single file, using all extensions it is configured for.
+
+        Args:
+            full_name: Complete filename
+            known_extensions: List of all file name extensions we are configured to work on
+            file_extensions_map: Mapping of file name extensions to Stevedore extensions
+
+        Returns:
+            List of the results of each extension, or None if the file type is not searched
+        """
         filename_extension = os.path.splitext(full_name)[1][1:]
 
         if filename_extension not in known_extensions:
-            self.echo.echo_vvv(
-                f"{filename_extension} is not a known extension, skipping ({full_name})."
-            )
-            return
+            self.echo.echo_vvv("{} is not a known extension, skipping ({}).", filename_extension, full_name)
+            return None
 
         self.echo.echo_vvv(full_name)
 
@@ -63,11 +98,22 @@ class StaticSearch(BaseSearch):
             # Call search_extension on all loaded extensions
             results = self.config.mgr.map(self.search_extension, file_handle, file_extensions_map, filename_extension)
 
-            # Strip out plugin name, as it's already in the annotation
-            results = [r for _, r in results]
+        # Strip out plugin name, as it's already in the annotation
+        return [r for _, r in results]
 
-            # Format and add the results to our running full set
-            self.format_file_results(all_results, results)
+    def _iter_source_files(self):
+        """
+        Yield the names of all files to search.
+
+        Yields:
+            Complete filenames
+        """
+        if os.path.isfile(self.config.source_path):
+            yield self.config.source_path
+        else:
+            for root, _, files in os.walk(self.config.source_path):
+                for filename in files:
+                    yield os.path.join(root, filename)
 
     def search(self):
         """
@@ -79,18 +125,71 @@ class StaticSearch(BaseSearch):
         # Index the results by extension name
         file_extensions_map = {}
         known_extensions = set()
-        for extension_name in self.config.extensions:
-            file_extensions_map[extension_name] = self.config.extensions[extension_name]
-            known_extensions.update(self.config.extensions[extension_name])
+        for extension_name, file_extensions in self.config.extensions.items():
+            file_extensions_map[extension_name] = file_extensions
+            known_extensions.update(file_extensions)
 
         all_results = {}
 
-        if os.path.isfile(self.config.source_path):
-            self._search_one_file(self.config.source_path, known_extensions, file_extensions_map, all_results)
+        if self.jobs > 1:
+            # Files are searched in worker processes, and their results and output are collected here in the same
+            # order as a serial search would, so that neither depends on the number of jobs.
+            with ProcessPoolExecutor(
+                max_workers=self.jobs,
+                initializer=_init_search_worker,
+                initargs=(self.config.config_file_path, self.config.source_path, self.echo.verbosity),
+            ) as executor:
+                for output, results in executor.map(
+                    _search_file_in_worker,
+                    self._iter_source_files(),
+                    itertools.repeat(known_extensions),
+                    itertools.repeat(file_extensions_map),
+                    chunksize=SEARCH_WORKER_CHUNKSIZE,
+                ):
+                    if output:
+                        self.echo(output, nl=False)
+                    if results is not None:
+                        self.format_file_results(all_results, results)
         else:
-            for root, _, files in os.walk(self.config.source_path):
-                for filename in files:
-                    full_name = os.path.join(root, filename)
-                    self._search_one_file(full_name, known_extensions, file_extensions_map, all_results)
+            for full_name in self._iter_source_files():
+                self._search_one_file(full_name, known_extensions, file_extensions_map, all_results)
 
         return all_results
+
+
+# Searcher used by each worker process of a parallel search, see _init_search_worker
+_worker_searcher = None
+
+
+def _init_search_worker(config_file_path, source_path, verbosity):  # pragma: no cover
+    """
+    Set up the searcher of a parallel search worker process.
+
+    Extensions cannot be sent to other processes, so each worker loads the configuration, and its extensions, again.
+    The configuration is loaded quietly, since the parent search already reported it.
+
+    Args:
+        config_file_path: Path to the configuration file of the parent search
+        source_path: Source path of the parent search
+        verbosity: Verbosity level of the parent search
+    """
+    global _worker_searcher  # pylint: disable=global-statement
+    config = AnnotationConfig(config_file_path, verbosity=-1, source_path_override=source_path)
+    config.echo.verbosity = verbosity
+    _worker_searcher = StaticSearch(config)
+
+
+def _search_file_in_worker(full_name, known_extensions, file_extensions_map):  # pragma: no cover
+    """
+    Search a single file in a parallel search worker process.
+
+    Output of the search is captured, to be written by the parent search along with the results.
+
+    Returns:
+        Tuple of (output of the search, list of the results of each extension or None if the file type is not searched)
+    """
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        results = _worker_searcher._get_file_results(  # pylint: disable=protected-access
+            full_name, known_extensions, file_extensions_map
+        )
+    return output.getvalue(), results
@@ -2,7 +2,6 @@
 Contains functionality for turning YAML reports into human-readable documentation.
 """
 
-import collections
 import datetime
 import os
 
@@ -10,6 +9,8 @@ import jinja2
 import yaml
 from slugify import slugify
 
+from code_annotations.base import SafeLoader
+
 
 class ReportRenderer:
     """
@@ -34,6 +35,7 @@ class ReportRenderer:
         self.jinja_environment = jinja2.Environment(
             autoescape=False,
             loader=jinja2.FileSystemLoader(self.config.report_template_dir),
+            bytecode_cache=self._get_bytecode_cache(),
             lstrip_blocks=True,
             trim_blocks=True
         )
@@ -41,13 +43,28 @@ class ReportRenderer:
         self.all_choices = []
         self.group_mapping = {}
 
-        for token in self.config.choices:
-            self.all_choices.extend(self.config.choices[token])
+        for choices in self.config.choices.values():
+            self.all_choices.extend(choices)
 
-        for group_name in self.config.groups:
-            for token in self.config.groups[group_name]:
+        for group_name, group_tokens in self.config.groups.items():
+            for token in group_tokens:
                 self.group_mapping[token] = group_name
 
+    def _get_bytecode_cache(self):
+        """
+        Get a cache for compiled templates, kept in a private per-user temp directory between runs.
+
+        The cache is only an optimization, templates are compiled on every run when no usable temp directory exists.
+
+        Returns:
+            A jinja2.FileSystemBytecodeCache, or None if the cache directory cannot be used
+        """
+        try:
+            return jinja2.FileSystemBytecodeCache()
+        except (RuntimeError, OSError) as exc:
+            self.echo.echo_v(f"Not caching compiled templates: {exc}")
+            return None
+
     def _add_report_file_to_full_report(self, report_file, report):
         """
         Add a specified report file to a report.
@@ -59,30 +76,52 @@ class ReportRenderer:
         Returns:
 
         """
-        loaded_report = yaml.safe_load(report_file)
+        loaded_report = yaml.load(report_file, Loader=SafeLoader)
 
-        for filename in loaded_report:
+        for filename, loaded_annotations in loaded_report.items():
             if filename in report:
-                for loaded_annotation in loaded_report[filename]:
-                    found = False
-                    for report_annotation in report[filename]:
-                        index_keys = ('line_number', 'annotation_token', 'annotation_data')
-
-                        if all(loaded_annotation[k] == report_annotation[k] for k in index_keys):
-                            report_annotation.update(loaded_annotation)
-                            found = True
-                            break
-
-                    if not found:
-                        report[filename].append(loaded_annotation)
+                file_report = report[filename]
+
+                # Index the annotations already in the report, keeping the first of any duplicates, so that each
+                # loaded annotation is matched with a single lookup instead of a scan of the whole file's report.
+                report_index = {}
+                for report_annotation in file_report:
+                    report_index.setdefault(self._get_annotation_index_key(report_annotation), report_annotation)
+
+                for loaded_annotation in loaded_annotations:
+                    index_key = self._get_annotation_index_key(loaded_annotation)
+                    report_annotation = report_index.get(index_key)
+
+                    if report_annotation is None:
+                        file_report.append(loaded_annotation)
+                        report_index[index_key] = loaded_annotation
+                    else:
+                        report_annotation.update(loaded_annotation)
             else:
-                report[filename] = loaded_report[filename]
+                report[filename] = loaded_annotations
+
+    @staticmethod
+    def _get_annotation_index_key(annotation):
+        """
+        Get the key identifying an annotation when merging reports.
+
+        Args:
+            annotation: A single annotation dict from a report
+
+        Returns:
+            Hashable tuple of the annotation's line number, token and data
+        """
+        annotation_data = annotation['annotation_data']
+        # Choice annotations hold a list of choices
+        if isinstance(annotation_data, list):
+            annotation_data = tuple(annotation_data)
+        return annotation['line_number'], annotation['annotation_token'], annotation_data
 
     def _aggregate_reports(self):
         """
         Combine all of the given report files into a single report object.
         """
-        report = collections.defaultdict(list)
+        report = {}
 
         # Combine report files into a single dict. If there are duplicate annotations, make sure we have the superset
         # of data.
@@ -123,27 +162,32 @@ class ReportRenderer:
         """
         Generate a page of documentation for each configured annotation choice.
         """
-        for choice in self.all_choices:
-            choice_report = collections.defaultdict(list)
-            for filename in self.full_report:
-                for annotation in self.full_report[filename]:
-                    if isinstance(annotation['annotation_data'], list) and choice in annotation['annotation_data']:
-                        choice_report[filename].append(annotation)
+        # Sort annotations by choice in a single pass over the report, keeping the report's file and annotation order
+        choice_reports = {}
+        for filename, annotations in self.full_report.items():
+            for annotation in annotations:
+                if isinstance(annotation['annotation_data'], list):
+                    # An annotation is listed once per choice, even if the choice was repeated in it
+                    for choice in set(annotation['annotation_data']):
+                        choice_reports.setdefault(choice, {}).setdefault(filename, []).append(annotation)
 
-            self._write_doc_file(f'choice_{choice}', choice_report)
+        for choice in self.all_choices:
+            self._write_doc_file(f'choice_{choice}', choice_reports.get(choice, {}))
 
     def _generate_per_annotation_docs(self):
         """
         Generate a page of documentation for each configured annotation.
         """
-        for annotation in self.config.annotation_tokens:
-            annotation_report = collections.defaultdict(list)
-            for filename in self.full_report:
-                for report_annotation in self.full_report[filename]:
-                    if report_annotation['annotation_token'] == annotation:
-                        annotation_report[filename].append(report_annotation)
+        # Sort annotations by token in a single pass over the report, keeping the report's file and annotation order
+        annotation_reports = {}
+        for filename, annotations in self.full_report.items():
+            for annotation in annotations:
+                annotation_reports.setdefault(
+                    annotation['annotation_token'], {}
+                ).setdefault(filename, []).append(annotation)
 
-            self._write_doc_file(f'annotation_{annotation}', annotation_report)
+        for annotation in self.config.annotation_tokens:
+            self._write_doc_file(f'annotation_{annotation}', annotation_reports.get(annotation, {}))
 
     def render(self):
         """
@@ -1,11 +1,10 @@
 """
 Helpers for code_annotations scripts.
 """
+import functools
 import os
 import re
 import sys
-from io import StringIO
-from pprint import pprint
 
 import click
 
@@ -63,44 +62,68 @@ class VerboseEcho:
         if verbosity_level <= self.verbosity:
             click.secho(output, **kwargs)
 
-    def echo_v(self, output, **kwargs):
+    def _echo_formatted(self, verbosity_level, output, args, kwargs):
+        """
+        Format the given output with args and echo it, if over the verbosity threshold.
+
+        The output is only formatted when it is actually going to be displayed.
+
+        Args:
+            verbosity_level: Only output if our verbosity level is >= this.
+            output: Text to output, or str.format template if args are given
+            args: Positional args used to format the output
+            kwargs: Any additional keyword args to pass to click.echo
+        """
+        if verbosity_level <= self.verbosity:
+            if args:
+                output = output.format(*args)
+            click.secho(output, **kwargs)
+
+    def echo_v(self, output, *args, **kwargs):
         """
         Echo the given output if verbosity level is >= 1.
 
         Args:
-            output: Text to output
+            output: Text to output, or str.format template if args are given
+            args: Positional args used to format the output, only if it is displayed
             kwargs: Any additional keyword args to pass to click.echo
         """
-        self.echo(output, 1, **kwargs)
+        self._echo_formatted(1, output, args, kwargs)
 
-    def echo_vv(self, output, **kwargs):
+    def echo_vv(self, output, *args, **kwargs):
         """
         Echo the given output if verbosity level is >= 2.
 
         Args:
-            output: Text to output
+            output: Text to output, or str.format template if args are given
+            args: Positional args used to format the output, only if it is displayed
             kwargs: Any additional keyword args to pass to click.echo
         """
-        self.echo(output, 2, **kwargs)
+        self._echo_formatted(2, output, args, kwargs)
 
-    def echo_vvv(self, output, **kwargs):
+    def echo_vvv(self, output, *args, **kwargs):
         """
         Echo the given output if verbosity level is >= 3.
 
         Args:
-            output: Text to output
+            output: Text to output, or str.format template if args are given
+            args: Positional args used to format the output, only if it is displayed
             kwargs: Any additional keyword args to pass to click.echo
         """
-        self.echo(output, 3, **kwargs)
+        self._echo_formatted(3, output, args, kwargs)
 
     def pprint(self, data, indent=4, verbosity_level=0):
         """
         Pretty-print some data with the given verbosity level.
+
+        The data is only formatted when it is actually going to be displayed.
         """
-        formatted = StringIO()
-        pprint(data, indent=indent, stream=formatted)
-        formatted.seek(0)
-        self.echo(formatted.read(), verbosity_level=verbosity_level)
+        if verbosity_level > self.verbosity:
+            return
+
+        from pprint import pformat  # pylint: disable=import-outside-toplevel
+
+        self.echo(pformat(data, indent=indent), verbosity_level=verbosity_level)
 
 
 def clean_abs_path(filename_to_clean, parent_path):
@@ -136,9 +159,27 @@ def get_annotation_regex(annotation_regexes):
 
     Unfortunately, the indenting spaces will find their way to the content of the "token" group.
 
+    The compiled regex is cached, so that all extensions and searchers configured for the same tokens share it.
+
     Args:
         annotation_regexes: List of re.escaped annotation tokens to search for.
 
+    Returns:
+        Regex ready for searching comments for annotations.
+    """
+    return _compile_annotation_regex(tuple(annotation_regexes))
+
+
+@functools.lru_cache(maxsize=8)
+def _compile_annotation_regex(annotation_regexes):
+    """
+    Compile the full regex to search inside comments for the given annotation tokens.
+
+    See get_annotation_regex.
+
+    Args:
+        annotation_regexes: Tuple of re.escaped annotation tokens to search for.
+
     Returns:
         Regex ready for searching comments for annotations.
     """
@@ -162,7 +203,9 @@ def get_annotation_regex(annotation_regexes):
         )*                           # any number of times
     )
     """
-    annotation_regex = annotation_regex.format(tokens='|'.join(annotation_regexes))
+    # Longer tokens are tried first, so that a token which is a prefix of another one does not shadow it
+    tokens = '|'.join(sorted(annotation_regexes, key=len, reverse=True))
+    annotation_regex = annotation_regex.format(tokens=tokens)
     return re.compile(annotation_regex, flags=re.VERBOSE)
 
 
@@ -42,9 +42,16 @@ class FakeConfig:
     annotations = {}
     annotation_regexes = []
     annotation_tokens = []
-    groups = []
+    groups = {}
     echo = VerboseEcho()
 
+    @property
+    def token_to_group(self):
+        """
+        Map annotation tokens to the name of their group, as AnnotationConfig does.
+        """
+        return {token: group_name for group_name, tokens in self.groups.items() for token in tokens}
+
 
 class FakeSearch(BaseSearch):
     """
@@ -1,9 +1,11 @@
 """
 Tests for code_annotations/base.py
 """
+import os
 from collections import OrderedDict
 
 import pytest
+import yaml
 
 from code_annotations.base import AnnotationConfig, ConfigurationException
 from tests.helpers import FakeConfig, FakeSearch
@@ -25,6 +27,20 @@ def test_get_group_for_token_multiple_groups():
     assert search._get_group_for_token('foo') == 'group2'  # pylint: disable=protected-access
 
 
+def test_group_indexes():
+    config = AnnotationConfig('tests/test_configurations/.annotations_test', None, 3)
+
+    assert config.token_to_group == {
+        '.. pii:': 'pii_group',
+        '.. pii_types:': 'pii_group',
+        '.. pii_retirement:': 'pii_group',
+        '.. pii_optional:': 'pii_group',
+    }
+    assert config.group_sets == {'pii_group': set(config.token_to_group)}
+    assert config.required_group_tokens == {'pii_group': ['.. pii:', '.. pii_types:', '.. pii_retirement:']}
+    assert config.choice_sets['.. pii_types:'] == frozenset(config.choices['.. pii_types:'])
+
+
 @pytest.mark.parametrize("test_config,expected_message", [
     ('.annotations_test_missing_source_path', "source_path"),
     ('.annotations_test_missing_report_path', "report_path"),
@@ -72,6 +88,22 @@ def test_annotation_configuration_errors(test_config, expected_message):
     assert expected_message in exc_msg
 
 
+def test_iter_groups():
+    search = FakeSearch(FakeConfig())
+    annotations = [
+        {'line_number': 1, 'annotation_token': 'token1'},
+        {'line_number': 1, 'annotation_token': 'token2'},
+        {'line_number': 5, 'annotation_token': 'token1'},
+        {'line_number': 5, 'annotation_token': 'token1', 'extra': {'object_id': 'model.a'}},
+        {'line_number': 5, 'annotation_token': 'token2', 'extra': {'object_id': 'model.a'}},
+    ]
+
+    # Groups are collected before being inspected, to make sure that each one is a distinct list
+    groups = list(search.iter_groups(annotations))
+
+    assert groups == [annotations[0:2], annotations[2:3], annotations[3:5]]
+
+
 def test_format_results_for_report():
     """
     Test that report formatting puts annotations into groups correctly
@@ -170,3 +202,51 @@ def test_format_results_for_report():
                 if fake['annotation_data'] == formatted['annotation_data']:
                     assert fake['expected_group_id'] == formatted['report_group_id']
                     break
+
+
+def test_configuration_is_reloaded_when_modified(tmp_path):
+    config_path = tmp_path / '.annotations'
+    with open('tests/test_configurations/.annotations_test') as f:
+        raw_config = f.read()
+    config_path.write_text(raw_config)
+
+    config = AnnotationConfig(str(config_path), None, 3)
+    assert '.. no_pii:' in config.annotation_tokens
+
+    # Modifying the loaded configuration must not affect the cached one
+    config.choices['.. ignored:'].append('modified')
+    assert 'modified' not in AnnotationConfig(str(config_path), None, 3).choices['.. ignored:']
+
+    config_path.write_text(raw_config.replace('.. no_pii:', '.. no_pii_at_all:'))
+    mtime_ns = config_path.stat().st_mtime_ns + 1_000_000_000
+    os.utime(config_path, ns=(mtime_ns, mtime_ns))
+
+    config = AnnotationConfig(str(config_path), None, 3)
+    assert '.. no_pii:' not in config.annotation_tokens
+    assert '.. no_pii_at_all:' in config.annotation_tokens
+
+    # A rewrite that keeps the modification time is still picked up when the size changes
+    config_path.write_text(raw_config.replace('.. no_pii:', '.. no_pii_again:'))
+    os.utime(config_path, ns=(mtime_ns, mtime_ns))
+
+    config = AnnotationConfig(str(config_path), None, 3)
+    assert '.. no_pii_at_all:' not in config.annotation_tokens
+    assert '.. no_pii_again:' in config.annotation_tokens
+
+
+@pytest.mark.parametrize("results", [
+    {},
+    {
+        'foo/baz.py': [{'annotation_token': '.. pii:', 'annotation_data': 'baz', 'line_number': 3}],
+        'foo/bar.py': [
+            {'annotation_token': '.. pii_types:', 'annotation_data': ['id', 'name'], 'line_number': 1},
+            {'annotation_token': '.. pii:', 'annotation_data': 'multi\nline: data', 'line_number': 1},
+        ],
+    },
+])
+def test_report_documents_match_single_dump(results):
+    search = FakeSearch(FakeConfig())
+    report = ''.join(search._iter_report_documents(results))  # pylint: disable=protected-access
+
+    assert report == yaml.safe_dump(results, default_flow_style=False)
+    assert yaml.safe_load(report) == results
@@ -124,3 +124,49 @@ def test_no_lint():
     assert "Search found 20 annotations" in result.output
     assert "Linting passed without errors." not in result.output
     assert "Writing report..." in result.output
+
+
+def test_parallel_jobs():
+    result = call_script((
+        'static_find_annotations',
+        '--config_file',
+        'tests/test_configurations/.annotations_test',
+        '--source_path=tests/extensions/javascript_test_files',
+        '--jobs=2',
+        '-v'
+    ))
+    assert result.exit_code == EXIT_CODE_FAILURE
+    assert 'group_failures_4' in result.output
+    assert 'choice_failures_1' in result.output
+
+
+def test_invalid_jobs():
+    result = call_script((
+        'static_find_annotations',
+        '--config_file',
+        'tests/test_configurations/.annotations_test',
+        '--jobs=0',
+    ))
+    assert result.exit_code == 2
+    assert "Invalid value for '-j' / '--jobs'" in result.output
+
+
+@patch('code_annotations.find_static.StaticSearch.search')
+def test_unexpected_error_traceback_only_when_verbose(mock_search):
+    mock_search.side_effect = Exception('Fake search failure')
+    args = (
+        'static_find_annotations',
+        '--config_file',
+        'tests/test_configurations/.annotations_test',
+    )
+
+    result = call_script(args)
+    assert result.exit_code == EXIT_CODE_FAILURE
+    assert 'Fake search failure' in result.output
+    assert 'Traceback' not in result.output
+
+    result = call_script(args + ('-v',))
+    assert result.exit_code == EXIT_CODE_FAILURE
+    assert 'Fake search failure' in result.output
+    assert 'Traceback' in result.output
+    assert 'None' not in result.output
@@ -3,6 +3,7 @@ Tests for the `generate_docs` sub-command.
 """
 import os
 import re
+import tempfile
 
 import yaml
 
@@ -168,3 +169,25 @@ def test_generate_report_missing_key():
 
     assert report_result.exit_code == EXIT_CODE_FAILURE
     assert "No report_template_dir key in tests/test_configurations/" in report_result.output
+    assert "Traceback" not in report_result.output
+
+
+def test_generate_report_without_usable_temp_dir(tmp_path, monkeypatch):
+    # Jinja refuses to use its template cache directory when something else is in the way
+    (tmp_path / f'_jinja2-cache-{os.getuid()}').write_text('not a directory')
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+
+    report_file = 'test_reports/test_no_temp_dir.yaml'
+    _do_find('tests/extensions/python_test_files/simple_success.pyt', report_file)
+
+    report_result = call_script((
+        'generate_docs',
+        report_file,
+        '--config_file',
+        'tests/test_configurations/.annotations_test_success_with_report_docs',
+        '-v',
+    ))
+
+    assert report_result.exit_code == EXIT_CODE_SUCCESS
+    assert "Not caching compiled templates" in report_result.output
+    assert "Report rendered in" in report_result.output
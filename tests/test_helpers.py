@@ -0,0 +1,80 @@
+"""
+Tests for code_annotations/helpers.py
+"""
+import re
+
+from code_annotations.helpers import VerboseEcho, get_annotation_regex
+
+
+class FormatCounter:
+    """
+    Object that counts how many times it has been formatted or pretty-printed.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __format__(self, format_spec):
+        self.count += 1
+        return "formatted"
+
+    def __repr__(self):
+        self.count += 1
+        return "FormatCounter()"
+
+
+def test_echo_formats_args_when_verbose(capsys):
+    echo = VerboseEcho()
+    echo.verbosity = 2
+    echo.echo_vv("Value: {}, {}", "foo", 3)
+
+    assert "Value: foo, 3" in capsys.readouterr().out
+
+
+def test_echo_skips_formatting_when_not_verbose(capsys):
+    echo = VerboseEcho()
+    echo.verbosity = 1
+    counter = FormatCounter()
+    echo.echo_vv("Value: {}", counter)
+    echo.echo_vvv("Value: {}", counter)
+
+    assert counter.count == 0
+    assert capsys.readouterr().out == ""
+
+
+def test_echo_without_args_is_not_formatted(capsys):
+    echo = VerboseEcho()
+    echo.verbosity = 1
+    echo.echo_v("Braces {} are left alone")
+
+    assert "Braces {} are left alone" in capsys.readouterr().out
+
+
+def test_pprint_skips_formatting_when_not_verbose(capsys):
+    echo = VerboseEcho()
+    echo.verbosity = 1
+    counter = FormatCounter()
+    echo.pprint({"key": counter}, verbosity_level=2)
+
+    assert counter.count == 0
+    assert capsys.readouterr().out == ""
+
+    echo.verbosity = 2
+    echo.pprint({"key": "value"}, verbosity_level=2)
+
+    assert "{'key': 'value'}" in capsys.readouterr().out
+
+
+def test_annotation_regex_is_compiled_once():
+    regex = get_annotation_regex([re.escape(".. pii:"), re.escape(".. no_pii:")])
+
+    assert regex is get_annotation_regex([re.escape(".. pii:"), re.escape(".. no_pii:")])
+    assert regex is not get_annotation_regex([re.escape(".. pii:")])
+
+
+def test_annotation_regex_prefers_longest_token():
+    regex = get_annotation_regex([re.escape(".. toggle"), re.escape(".. toggle_name:")])
+    match = regex.search(".. toggle_name: my_toggle")
+
+    assert match.group("token") == ".. toggle_name:"
+    assert match.group("data") == " my_toggle"
@@ -43,3 +43,24 @@ def test_annotation_errors_ordering():
     # This is just to check that the ordering of the annotation error types does not change. You should not change this
     # test, but eventually add your own below.
     assert annotation_errors.MissingToken == annotation_errors.TYPES[5]
+
+
+def test_parallel_search_matches_serial_search(capsys):
+    config = AnnotationConfig(
+        "tests/test_configurations/.annotations_test",
+        verbosity=3,
+        source_path_override="tests/extensions",
+    )
+    capsys.readouterr()
+
+    serial_results = StaticSearch(config).search()
+    serial_output = capsys.readouterr().out
+    parallel_results = StaticSearch(config, jobs=2).search()
+    parallel_output = capsys.readouterr().out
+
+    assert serial_results
+    assert list(serial_results.items()) == list(parallel_results.items())
+
+    # Per-file output of the workers is written as well, in the same order
+    assert "is not a known extension, skipping" in serial_output
+    assert serial_output == parallel_output